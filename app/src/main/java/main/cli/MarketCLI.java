@@ -0,0 +1,106 @@
+package main.java.main.cli;
+
+import java.util.*;
+import java.util.logging.*;
+import java.util.regex.Pattern;
+
+import main.java.main.client.MarketClient;
+
+public abstract class MarketCLI {
+    private static final Logger logger = Logger.getLogger(MarketCLI.class.getName());
+    private static final String DEFAULT_HOST = "localhost";
+    private static final int DEFAULT_PORT = 5000;
+    private static final Pattern WHITESPACE = Pattern.compile("\\s+");
+    protected final Scanner scanner;
+    protected final String host;
+    protected final int port;
+    private final String helpText;
+    private final Map<String, Command> commands = new HashMap<>();
+
+    @FunctionalInterface
+    protected interface Command {
+        void execute(String[] args) throws Exception;
+    }
+
+    protected MarketCLI(Scanner scanner, String helpText) {
+        this.scanner = scanner;
+        this.helpText = helpText;
+
+        String host = DEFAULT_HOST;
+        int port = DEFAULT_PORT;
+
+        try {
+            System.out.print("Enter server host (default: localhost): ");
+            String inputHost = scanner.nextLine().trim();
+            if (!inputHost.isEmpty()) {
+                host = inputHost;
+            }
+
+            System.out.print("Enter server port (default: 5000): ");
+            String inputPort = scanner.nextLine().trim();
+            if (!inputPort.isEmpty()) {
+                port = Integer.parseInt(inputPort);
+            }
+        } catch (NoSuchElementException e) {
+            logger.info("Using default connection settings");
+        }
+
+        logger.info(String.format("Connecting to %s:%d", host, port));
+        this.host = host;
+        this.port = port;
+
+        commands.put("help", args -> printHelp());
+    }
+
+    protected abstract MarketClient getClient();
+
+    protected void addCommand(String name, Command command) {
+        commands.put(name, command);
+    }
+
+    public void run() {
+        MarketClient client = getClient();
+        try {
+            client.connect();
+            printHelp();
+
+            while (true) {
+                try {
+                    System.out.print("\nEnter command: ");
+                    String command = scanner.nextLine().trim().toLowerCase();
+                    if (command.isEmpty()) continue;
+
+                    String[] parts = WHITESPACE.split(command);
+
+                    if (parts[0].equals("quit")) {
+                        return;
+                    }
+
+                    Command handler = commands.get(parts[0]);
+                    if (handler == null) {
+                        System.out.println("Unknown command. Type 'help' for available commands.");
+                    } else {
+                        handler.execute(parts);
+                    }
+                } catch (NoSuchElementException e) {
+                    break;
+                } catch (IllegalArgumentException | IllegalStateException e) {
+                    logger.warning("Command rejected: " + e.getMessage());
+                    System.out.println("Error: " + e.getMessage());
+                } catch (Exception e) {
+                    logger.log(Level.WARNING, "Error executing command", e);
+                    System.out.println("Error: " + e.getMessage());
+                }
+            }
+        } catch (Exception e) {
+            logger.log(Level.SEVERE, "Fatal error", e);
+            System.out.println("Fatal error: " + e.getMessage());
+        } finally {
+            client.close();
+        }
+    }
+
+    protected void printHelp() {
+        System.out.print(helpText);
+    }
+}
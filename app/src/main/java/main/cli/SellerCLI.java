@@ -1,92 +1,41 @@
 package main.java.main.cli;
 
 import java.util.*;
-import java.util.logging.*;
 
 import main.java.main.client.SellerClient;
 import main.java.main.market.Item;
 
-public class SellerCLI {
-    private static final Logger logger = Logger.getLogger(SellerCLI.class.getName());
+public class SellerCLI extends MarketCLI {
+    private static final String HELP_TEXT = "\nAvailable commands:\n"
+        + "start <item_name> <quantity> - Start selling an item\n"
+        + "end - End current sale\n"
+        + "status - Show current sale status\n"
+        + "help - Show this help message\n"
+        + "quit - Exit the marketplace\n";
+    private static final String STATUS_FORMAT = "%nCurrent Sale:%n"
+        + "Name: %s%n"
+        + "Quantity: %.2f%n"
+        + "Time remaining: %.1fs%n";
     private final SellerClient client;
-    private final Scanner scanner;
-    private static final String DEFAULT_HOST = "localhost";
-    private static final int DEFAULT_PORT = 5000;
 
     public SellerCLI(Scanner scanner) {
-        this.scanner = scanner;
-        
-        String host = DEFAULT_HOST;
-        int port = DEFAULT_PORT;
-
-        try {
-            System.out.print("Enter server host (default: localhost): ");
-            String inputHost = scanner.nextLine().trim();
-            if (!inputHost.isEmpty()) {
-                host = inputHost;
-            }
+        super(scanner, HELP_TEXT);
+        client = new SellerClient(host, port);
 
-            System.out.print("Enter server port (default: 5000): ");
-            String inputPort = scanner.nextLine().trim();
-            if (!inputPort.isEmpty()) {
-                port = Integer.parseInt(inputPort);
+        addCommand("start", args -> {
+            if (args.length < 3) {
+                System.out.println("Usage: start <item_name> <quantity>");
+                return;
             }
-        } catch (NoSuchElementException e) {
-            logger.info("Using default connection settings");
-        }
-
-        logger.info(String.format("Connecting to %s:%d", host, port));
-        client = new SellerClient(host, port);
+            startSale(args[1], Double.parseDouble(args[2]));
+        });
+        addCommand("end", args -> endSale());
+        addCommand("status", args -> showStatus());
     }
 
-    public void run() {
-        try {
-            client.connect();
-            printHelp();
-
-            while (true) {
-                try {
-                    System.out.print("\nEnter command: ");
-                    String command = scanner.nextLine().trim().toLowerCase();
-                    if (command.isEmpty()) continue;
-                    
-                    String[] parts = command.split("\\s+");
-
-                    switch (parts[0]) {
-                        case "start":
-                            if (parts.length < 3) {
-                                System.out.println("Usage: start <item_name> <quantity>");
-                                break;
-                            }
-                            startSale(parts[1], Double.parseDouble(parts[2]));
-                            break;
-                        case "end":
-                            endSale();
-                            break;
-                        case "status":
-                            showStatus();
-                            break;
-                        case "help":
-                            printHelp();
-                            break;
-                        case "quit":
-                            return;
-                        default:
-                            System.out.println("Unknown command. Type 'help' for available commands.");
-                    }
-                } catch (NoSuchElementException e) {
-                    break;
-                } catch (Exception e) {
-                    logger.log(Level.WARNING, "Error executing command", e);
-                    System.out.println("Error: " + e.getMessage());
-                }
-            }
-        } catch (Exception e) {
-            logger.log(Level.SEVERE, "Fatal error", e);
-            System.out.println("Fatal error: " + e.getMessage());
-        } finally {
-            client.close();
-        }
+    @Override
+    protected SellerClient getClient() {
+        return client;
     }
 
     private void startSale(String itemName, double quantity) throws Exception {
@@ -96,8 +45,11 @@ public class SellerCLI {
     }
 
     private void endSale() throws Exception {
-        client.endSale();
-        System.out.println("Sale ended successfully!");
+        if (client.endSale()) {
+            System.out.println("Sale ended successfully!");
+        } else {
+            System.out.println("Sale had already ended.");
+        }
     }
 
     private void showStatus() {
@@ -107,19 +59,8 @@ public class SellerCLI {
             return;
         }
 
-        System.out.println("\nCurrent Sale:");
-        System.out.println("Name: " + currentItem.getName());
-        System.out.printf("Quantity: %.2f%n", currentItem.getQuantity());
-        System.out.printf("Time remaining: %.1fs%n", currentItem.getRemainingTime());
-    }
-
-    private void printHelp() {
-        System.out.println("\nAvailable commands:");
-        System.out.println("start <item_name> <quantity> - Start selling an item");
-        System.out.println("end - End current sale");
-        System.out.println("status - Show current sale status");
-        System.out.println("help - Show this help message");
-        System.out.println("quit - Exit the marketplace");
+        System.out.print(String.format(STATUS_FORMAT, currentItem.getName(),
+                currentItem.getQuantity(), client.getRemainingTime()));
     }
 
     public static void main(String[] args) {
@@ -12,71 +12,55 @@ import main.java.main.market.MessageType;
 
 public class BuyerClient extends MarketClient {
     private static final Logger logger = Logger.getLogger(BuyerClient.class.getName());
-    private List<Item> availableItems = new ArrayList<>();
+    // Replaced wholesale on each listing or update, never modified in place
+    private volatile List<Item> availableItems = List.of();
 
     public BuyerClient(String host, int port) {
         super(host, port);
+        addHandler(MessageType.STOCK_UPDATE, this::handleStockUpdate);
     }
 
     @Override
-    protected void register() throws IOException {
-        sendMessage(new Message(
-            MessageType.REGISTER,
-            Map.of("clientType", ClientType.BUYER.name()),
-            "unregistered"
-        ));
+    protected ClientType getClientType() {
+        return ClientType.BUYER;
     }
 
     public List<Item> listItems() throws IOException, InterruptedException {
-        sendMessage(new Message(
+        Message response = request(new Message(
             MessageType.LIST_ITEMS,
             Collections.emptyMap(),
             clientId
-        ));
-
-        Message response = waitForResponse(5, TimeUnit.SECONDS);
-        if (response.getType() == MessageType.LIST_ITEMS) {
-            @SuppressWarnings("unchecked")
-            List<Item> items = (List<Item>) response.getData().get("items");
-            availableItems = items;
-            return items;
-        } else if (response.getType() == MessageType.ERROR) {
-            throw new RuntimeException((String) response.getData().get("error"));
-        }
-        throw new RuntimeException("Unexpected response type: " + response.getType());
+        ), MessageType.LIST_ITEMS, 5, TimeUnit.SECONDS);
+        @SuppressWarnings("unchecked")
+        List<Item> items = (List<Item>) response.getData().get("items");
+        updateAvailableItems(items);
+        return items;
     }
 
     public boolean buyItem(String itemId, double quantity) throws IOException, InterruptedException {
-        sendMessage(new Message(
+        Message response = request(new Message(
             MessageType.BUY_REQUEST,
             Map.of(
                 "itemId", itemId,
                 "quantity", quantity
             ),
             clientId
-        ));
+        ), MessageType.BUY_RESPONSE, 5, TimeUnit.SECONDS);
+        return (Boolean) response.getData().get("success");
+    }
 
-        Message response = waitForResponse(5, TimeUnit.SECONDS);
-        if (response.getType() == MessageType.BUY_RESPONSE) {
-            return (Boolean) response.getData().get("success");
-        } else if (response.getType() == MessageType.ERROR) {
-            throw new RuntimeException((String) response.getData().get("error"));
-        }
-        throw new RuntimeException("Unexpected response type: " + response.getType());
+    private void handleStockUpdate(Message message) {
+        @SuppressWarnings("unchecked")
+        List<Item> items = (List<Item>) message.getData().get("items");
+        updateAvailableItems(items);
+        logger.info("Stock update received: " + items.size() + " items available");
     }
 
-    @Override
-    protected void handleMessage(Message message) {
-        super.handleMessage(message);
-        if (message.getType() == MessageType.STOCK_UPDATE) {
-            @SuppressWarnings("unchecked")
-            List<Item> items = (List<Item>) message.getData().get("items");
-            availableItems = items;
-            logger.info("Stock update received: " + availableItems.size() + " items available");
-        }
+    private void updateAvailableItems(List<Item> items) {
+        availableItems = List.copyOf(items);
     }
 
     public List<Item> getAvailableItems() {
-        return Collections.unmodifiableList(availableItems);
+        return availableItems;
     }
 }
\ No newline at end of file
@@ -8,35 +8,80 @@ import java.util.concurrent.*;
 import java.util.logging.*;
 
 public abstract class MarketClient implements AutoCloseable {
-    protected static final Logger logger = Logger.getLogger(MarketClient.class.getName());
+    private static final Logger logger = Logger.getLogger(MarketClient.class.getName());
+    private static final ScheduledExecutorService heartbeatScheduler =
+        Executors.newSingleThreadScheduledExecutor(Threads.daemonThreadFactory("market-heartbeat"));
+    // Receivers only block in read(), so a small stack is enough
+    private static final long RECEIVER_STACK_SIZE = 256 * 1024;
+    private static final ExecutorService receiverPool =
+        Executors.newCachedThreadPool(Threads.daemonThreadFactory("market-receiver", RECEIVER_STACK_SIZE));
+    // REGISTER never varies, so each type's frame is encoded once
+    private static final Map<ClientType, byte[]> REGISTER_FRAMES = new EnumMap<>(ClientType.class);
+    static {
+        for (ClientType type : ClientType.values()) {
+            try {
+                REGISTER_FRAMES.put(type, MessageCodec.encodeFrame(new Message(
+                    MessageType.REGISTER,
+                    Map.of("clientType", type.name()),
+                    "unregistered"
+                )));
+            } catch (IOException e) {
+                throw new UncheckedIOException(e);
+            }
+        }
+    }
     protected final String host;
     protected final int port;
     protected Socket socket;
-    protected ObjectOutputStream out;
-    protected ObjectInputStream in;
+    protected DataOutputStream out;
+    protected FrameReader in;
     protected String clientId;
     protected volatile boolean running;
-    protected final ScheduledExecutorService heartbeatScheduler = Executors.newSingleThreadScheduledExecutor();
+    protected ScheduledFuture<?> heartbeatTask;
+    protected Future<?> receiverTask;
+    protected CountDownLatch registration;
     protected final BlockingQueue<Message> responseQueue = new LinkedBlockingQueue<>();
+    // Types without a handler are replies
+    private final Map<MessageType, MessageHandler> handlers = new EnumMap<>(MessageType.class);
+
+    @FunctionalInterface
+    protected interface MessageHandler {
+        void handle(Message message) throws Exception;
+    }
 
     public MarketClient(String host, int port) {
         this.host = host;
         this.port = port;
+
+        addHandler(MessageType.ACK, this::handleAck);
+        // Unsolicited, so it must not land in the response queue
+        addHandler(MessageType.STOCK_UPDATE, message -> { });
+    }
+
+    protected void addHandler(MessageType type, MessageHandler handler) {
+        handlers.put(type, handler);
     }
 
     public void connect() throws IOException {
-        socket = new Socket(host, port);
-        out = new ObjectOutputStream(socket.getOutputStream());
-        in = new ObjectInputStream(socket.getInputStream());
+        socket = new Socket();
+        // Small, latency-bound messages; don't let Nagle delay them
+        socket.setTcpNoDelay(true);
+        // Must be set before connect to affect window negotiation
+        socket.setSendBufferSize(MessageCodec.SOCKET_BUFFER_SIZE);
+        socket.setReceiveBufferSize(MessageCodec.SOCKET_BUFFER_SIZE);
+        socket.setKeepAlive(true);
+        socket.connect(new InetSocketAddress(host, port));
+        out = new DataOutputStream(new BufferedOutputStream(socket.getOutputStream()));
+        in = new FrameReader(new BufferedInputStream(socket.getInputStream(), MessageCodec.RECEIVE_BUFFER_SIZE));
         running = true;
+        registration = new CountDownLatch(1);
 
-        // Start message receiver thread
-        Thread receiverThread = new Thread(this::receiveMessages);
-        receiverThread.setDaemon(true);
-        receiverThread.start();
+        // Start message receiver
+        receiverTask = receiverPool.submit(this::receiveMessages);
 
-        // Register with server
+        // Wait for the ACK so the first command has a client id
         register();
+        awaitRegistration(5, TimeUnit.SECONDS);
 
         // Start heartbeat
         startHeartbeat();
@@ -44,10 +89,25 @@ public abstract class MarketClient implements AutoCloseable {
         logger.info("Connected to server: " + host + ":" + port);
     }
 
-    protected abstract void register() throws IOException;
+    protected abstract ClientType getClientType();
+
+    protected void register() throws IOException {
+        sendFrame(REGISTER_FRAMES.get(getClientType()));
+    }
+
+    private void awaitRegistration(long timeout, TimeUnit unit) throws IOException {
+        try {
+            if (!registration.await(timeout, unit)) {
+                throw new IOException("Registration not acknowledged within " + timeout + " " + unit);
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new InterruptedIOException("Interrupted while waiting for registration");
+        }
+    }
 
     protected void startHeartbeat() {
-        heartbeatScheduler.scheduleAtFixedRate(() -> {
+        heartbeatTask = heartbeatScheduler.scheduleAtFixedRate(() -> {
             try {
                 if (running && clientId != null) {
                     sendMessage(new Message(
@@ -65,7 +125,7 @@ public abstract class MarketClient implements AutoCloseable {
     protected void receiveMessages() {
         while (running) {
             try {
-                Message message = (Message) in.readObject();
+                Message message = in.read();
                 handleMessage(message);
             } catch (EOFException | SocketException e) {
                 if (running) {
@@ -73,6 +133,13 @@ public abstract class MarketClient implements AutoCloseable {
                     running = false;
                 }
                 break;
+            } catch (IOException e) {
+                // A rejected frame leaves the stream at an unknown offset; every later read would be garbage
+                if (running) {
+                    logger.severe("Protocol error, dropping connection: " + e.getMessage());
+                    running = false;
+                }
+                break;
             } catch (Exception e) {
                 logger.severe("Error receiving message: " + e.getMessage());
             }
@@ -81,26 +148,48 @@ public abstract class MarketClient implements AutoCloseable {
 
     protected void handleMessage(Message message) {
         try {
-            switch (message.getType()) {
-                case ACK:
-                    if (message.getData().containsKey("clientId")) {
-                        clientId = (String) message.getData().get("clientId");
-                        logger.info("Registered with ID: " + clientId);
-                    }
-                    break;
-                default:
-                    responseQueue.put(message);
-                    break;
+            MessageHandler handler = handlers.get(message.getType());
+            if (handler != null) {
+                handler.handle(message);
+            } else {
+                responseQueue.put(message);
             }
         } catch (Exception e) {
             logger.severe("Error handling message: " + e.getMessage());
         }
     }
 
-    protected synchronized void sendMessage(Message message) throws IOException {
-        out.writeObject(message);
-        out.flush();
-        logger.fine("Sent message: " + message.getType());
+    private void handleAck(Message message) {
+        if (message.getData().containsKey("clientId")) {
+            clientId = (String) message.getData().get("clientId");
+            logger.info("Registered with ID: " + clientId);
+            registration.countDown();
+        }
+    }
+
+    protected void sendMessage(Message message) throws IOException {
+        // Encode before taking the connection lock; only the write is serialized
+        sendFrame(MessageCodec.encodeFrame(message));
+        logger.fine(() -> "Sent message: " + message.getType());
+    }
+
+    protected synchronized void sendFrame(byte[] frame) throws IOException {
+        MessageCodec.sendFrame(out, frame);
+    }
+
+    protected Message request(Message message, MessageType expected, long timeout, TimeUnit unit)
+            throws IOException, InterruptedException {
+        byte[] frame = MessageCodec.encodeFrame(message);
+        // Drop any late reply to an earlier, timed-out request
+        responseQueue.clear();
+        sendFrame(frame);
+        Message response = waitForResponse(timeout, unit);
+        if (response.getType() == expected) {
+            return response;
+        } else if (response.getType() == MessageType.ERROR) {
+            throw new ServerErrorException((String) response.getData().get("error"));
+        }
+        throw new RuntimeException("Unexpected response type: " + response.getType());
     }
 
     protected Message waitForResponse(long timeout, TimeUnit unit) throws InterruptedException {
@@ -114,7 +203,9 @@ public abstract class MarketClient implements AutoCloseable {
     @Override
     public void close() {
         running = false;
-        heartbeatScheduler.shutdown();
+        if (heartbeatTask != null) {
+            heartbeatTask.cancel(false);
+        }
         try {
             if (socket != null && !socket.isClosed()) {
                 socket.close();
@@ -122,6 +213,18 @@ public abstract class MarketClient implements AutoCloseable {
         } catch (IOException e) {
             logger.warning("Error closing socket: " + e.getMessage());
         }
+
+        // Wait for the receiver to leave its loop so the pooled thread is free
+        if (receiverTask != null) {
+            try {
+                receiverTask.get(1, TimeUnit.SECONDS);
+            } catch (InterruptedException e) {
+                Thread.currentThread().interrupt();
+            } catch (ExecutionException | java.util.concurrent.TimeoutException e) {
+                logger.warning("Receiver did not stop cleanly: " + e);
+                receiverTask.cancel(true);
+            }
+        }
     }
 
     protected static class TimeoutException extends RuntimeException {
@@ -129,4 +232,11 @@ public abstract class MarketClient implements AutoCloseable {
             super(message);
         }
     }
+
+    // A request the server rejected, e.g. insufficient stock
+    public static class ServerErrorException extends IllegalStateException {
+        public ServerErrorException(String message) {
+            super(message);
+        }
+    }
 }
\ No newline at end of file
@@ -1,6 +1,7 @@
 package main.java.main.client;
 
 
+import main.java.main.market.ClientType;
 import main.java.main.market.Item;
 import main.java.main.market.Message;
 import main.java.main.market.MessageType;
@@ -8,21 +9,21 @@ import main.java.main.market.MessageType;
 import java.io.*;
 import java.util.*;
 import java.util.concurrent.TimeUnit;
+import java.util.logging.Logger;
 
 public class SellerClient extends MarketClient {
+    private static final Logger logger = Logger.getLogger(SellerClient.class.getName());
     private Item currentItem;
+    // Monotonic, unaffected by clock adjustments
+    private long saleDeadlineNanos;
 
     public SellerClient(String host, int port) {
         super(host, port);
     }
 
     @Override
-    protected void register() throws IOException {
-        sendMessage(new Message(
-            MessageType.REGISTER,
-            Map.of("clientType", "SELLER"),
-            "unregistered"
-        ));
+    protected ClientType getClientType() {
+        return ClientType.SELLER;
     }
 
     public void startSale(String itemName, double quantity) throws IOException, InterruptedException {
@@ -30,74 +31,56 @@ public class SellerClient extends MarketClient {
             throw new IllegalStateException("Already have active sale");
         }
 
-        sendMessage(new Message(
+        Map<String, Object> data = request(new Message(
             MessageType.SALE_START,
             Map.of(
                 "name", itemName,
                 "quantity", quantity
             ),
             clientId
-        ));
-
-        Message response = waitForResponse(5, TimeUnit.SECONDS);
-        if (response.getType() == MessageType.SALE_START) {
-            if ((Boolean) response.getData().get("success")) {
-                currentItem = new Item(
-                    (String) response.getData().get("itemId"),
-                    (String) response.getData().get("name"),
-                    (Double) response.getData().get("quantity"),
-                    clientId
-                );
-                logger.info("Sale started: " + currentItem.getName());
-            }
-        } else if (response.getType() == MessageType.ERROR) {
-            throw new RuntimeException((String) response.getData().get("error"));
-        } else {
-            throw new RuntimeException("Unexpected response type: " + response.getType());
+        ), MessageType.SALE_START, 5, TimeUnit.SECONDS).getData();
+        if ((Boolean) data.get("success")) {
+            currentItem = new Item(
+                (String) data.get("itemId"),
+                (String) data.get("name"),
+                (Double) data.get("quantity"),
+                clientId
+            );
+            double remainingTime = (Double) data.get("remainingTime");
+            saleDeadlineNanos = System.nanoTime() + (long) (remainingTime * 1_000_000_000L);
+            logger.info("Sale started: " + currentItem.getName());
         }
     }
 
-    public void endSale() throws IOException, InterruptedException {
+    public boolean endSale() throws IOException, InterruptedException {
         if (currentItem == null) {
             throw new IllegalStateException("No active sale");
         }
 
-        sendMessage(new Message(
+        Message response = request(new Message(
             MessageType.SALE_END,
             Map.of("itemId", currentItem.getId()),
             clientId
-        ));
-
-        Message response = waitForResponse(5, TimeUnit.SECONDS);
-        if (response.getType() == MessageType.SALE_END) {
-            if ((Boolean) response.getData().get("success")) {
-                currentItem = null;
-                logger.info("Sale ended");
-            }
-        } else if (response.getType() == MessageType.ERROR) {
-            throw new RuntimeException((String) response.getData().get("error"));
+        ), MessageType.SALE_END, 5, TimeUnit.SECONDS);
+        // Either way the sale is no longer running on the server
+        currentItem = null;
+        boolean success = (Boolean) response.getData().get("success");
+        if (success) {
+            logger.info("Sale ended");
         } else {
-            throw new RuntimeException("Unexpected response type: " + response.getType());
+            logger.info("Sale had already ended");
         }
+        return success;
     }
 
     public Item getCurrentItem() {
         return currentItem;
     }
 
-    @Override
-    protected void handleMessage(Message message) {
-        super.handleMessage(message);
-        if (message.getType() == MessageType.STOCK_UPDATE && currentItem != null) {
-            @SuppressWarnings("unchecked")
-            List<Item> items = (List<Item>) message.getData().get("items");
-            for (Item item : items) {
-                if (item.getId().equals(currentItem.getId())) {
-                    currentItem = item;
-                    logger.info("Stock updated for current item: " + item.getQuantity());
-                    break;
-                }
-            }
+    public double getRemainingTime() {
+        if (currentItem == null) {
+            return 0;
         }
+        return Math.max(0, saleDeadlineNanos - System.nanoTime()) / 1_000_000_000.0;
     }
 }
\ No newline at end of file
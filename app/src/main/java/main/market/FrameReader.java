@@ -0,0 +1,25 @@
+package main.java.main.market;
+
+import java.io.*;
+
+public class FrameReader {
+    private static final int INITIAL_BUFFER_SIZE = 8192;
+    private final DataInputStream in;
+    private final byte[] header = new byte[MessageCodec.HEADER_SIZE];
+    // Reused for every frame on this connection and only grown for larger payloads
+    private byte[] buffer = new byte[INITIAL_BUFFER_SIZE];
+
+    public FrameReader(InputStream in) {
+        this.in = new DataInputStream(in);
+    }
+
+    public Message read() throws IOException {
+        in.readFully(header);
+        int length = MessageCodec.getLength(header);
+        if (length > buffer.length) {
+            buffer = new byte[Math.max(length, buffer.length * 2)];
+        }
+        in.readFully(buffer, 0, length);
+        return MessageCodec.decode(buffer, 0, length);
+    }
+}
@@ -1,47 +1,79 @@
 package main.java.main.market;
 
-import java.io.Serializable;
-import java.time.Instant;
+import java.lang.invoke.MethodHandles;
+import java.lang.invoke.VarHandle;
 
-public class Item implements Serializable {
+public class Item {
+    static final long MAX_SALE_DURATION_MILLIS = 60_000;
+    private static final VarHandle QUANTITY;
+    static {
+        try {
+            QUANTITY = MethodHandles.lookup().findVarHandle(Item.class, "quantity", double.class);
+        } catch (ReflectiveOperationException e) {
+            throw new ExceptionInInitializerError(e);
+        }
+    }
     private final String id;
     private final String name;
-    private double quantity;
+    // Only ever changed by compare-and-set through QUANTITY
+    private volatile double quantity;
     private final String sellerId;
-    private final Instant saleStartTime;
-    private final int maxSaleDuration;
+    private final long saleEndMillis;
+    // Encoded immutable fields, cached by MessageCodec
+    private volatile byte[] encodedFields;
 
     public Item(String id, String name, double quantity, String sellerId) {
+        this(id, name, quantity, sellerId, System.currentTimeMillis() + MAX_SALE_DURATION_MILLIS);
+    }
+
+    Item(String id, String name, double quantity, String sellerId, long saleEndMillis) {
         this.id = id;
         this.name = name;
         this.quantity = quantity;
         this.sellerId = sellerId;
-        this.saleStartTime = Instant.now();
-        this.maxSaleDuration = 60; // 60 seconds
+        this.saleEndMillis = saleEndMillis;
     }
 
-    public synchronized boolean tryPurchase(double amount) {
+    public boolean tryPurchase(double amount) {
         if (amount <= 0) {
             throw new IllegalArgumentException("Purchase amount must be positive");
         }
-        if (quantity >= amount) {
-            quantity -= amount;
-            return true;
-        }
-        return false;
+        double current;
+        do {
+            current = quantity;
+            // Negated so a NaN amount fails
+            if (!(current >= amount)) {
+                return false;
+            }
+        } while (!QUANTITY.compareAndSet(this, current, current - amount));
+        return true;
+    }
+
+    double takeRemaining() {
+        return (double) QUANTITY.getAndSet(this, 0.0);
     }
 
     public String getId() { return id; }
     public String getName() { return name; }
     public double getQuantity() { return quantity; }
     public String getSellerId() { return sellerId; }
+    long getSaleEndMillis() { return saleEndMillis; }
+    byte[] getEncodedFields() { return encodedFields; }
+    void setEncodedFields(byte[] encodedFields) { this.encodedFields = encodedFields; }
     
     public double getRemainingTime() {
-        long elapsedSeconds = Instant.now().getEpochSecond() - saleStartTime.getEpochSecond();
-        return Math.max(0, maxSaleDuration - elapsedSeconds);
+        return getRemainingTime(System.currentTimeMillis());
+    }
+
+    public double getRemainingTime(long nowMillis) {
+        return Math.max(0, saleEndMillis - nowMillis) / 1000.0;
     }
 
     public boolean isExpired() {
-        return getRemainingTime() <= 0;
+        return isExpired(System.currentTimeMillis());
+    }
+
+    public boolean isExpired(long nowMillis) {
+        return nowMillis >= saleEndMillis;
     }
 }
\ No newline at end of file
@@ -22,19 +22,26 @@ public class MarketApplication {
     
     private static void setupLogging() {
         LogManager.getLogManager().reset();
-        ConsoleHandler handler = new ConsoleHandler();
-        handler.setFormatter(new SimpleFormatter() {
+        // Unlike ConsoleHandler, a plain StreamHandler does not flush per record,
+        // so the queue writer can emit a whole batch with a single flush
+        StreamHandler console = new StreamHandler(System.err, new SimpleFormatter() {
             @Override
             public String format(LogRecord record) {
                 return String.format("[%1$tF %1$tT] [%2$s] %3$s %n",
                     record.getMillis(),
                     record.getLevel().getLocalizedName(),
-                    record.getMessage()
+                    formatMessage(record)
                 );
             }
-        });
+        }) {
+            @Override
+            public synchronized void close() {
+                // Never close System.err
+                flush();
+            }
+        };
         Logger rootLogger = Logger.getLogger("");
-        rootLogger.addHandler(handler);
+        rootLogger.addHandler(new QueueLogHandler(console));
         rootLogger.setLevel(Level.INFO);
     }
 }
\ No newline at end of file
@@ -1,102 +1,157 @@
 package main.java.main.market;
 
 import java.util.concurrent.*;
+import java.util.concurrent.atomic.AtomicLong;
 import java.util.*;
 import java.util.logging.*;
 import java.util.stream.Collectors;
 
 public class MarketManager {
     private static final Logger logger = Logger.getLogger(MarketManager.class.getName());
+    private static final Map<String, Double> DEFAULT_STOCK = Map.of(
+        "flower", 5.0,
+        "sugar", 5.0,
+        "potato", 5.0,
+        "oil", 5.0
+    );
     private final ConcurrentHashMap<String, Item> activeItems = new ConcurrentHashMap<>();
-    private final ConcurrentHashMap<String, Map<String, Double>> sellerStocks = new ConcurrentHashMap<>();
-    private final ScheduledExecutorService scheduler = Executors.newSingleThreadScheduledExecutor();
+    private final ConcurrentHashMap<String, SellerStock> sellerStocks = new ConcurrentHashMap<>();
+    private final ScheduledThreadPoolExecutor scheduler =
+        new ScheduledThreadPoolExecutor(1, Threads.daemonThreadFactory("sale-expiry"));
+    private final ConcurrentHashMap<String, ScheduledFuture<?>> expiryTasks = new ConcurrentHashMap<>();
+    // sellerId -> itemId of that seller's open sale
+    private final ConcurrentHashMap<String, String> salesBySeller = new ConcurrentHashMap<>();
+    private final AtomicLong itemSequence = new AtomicLong();
+    private final long saleDurationMillis;
 
     public MarketManager() {
-        scheduler.scheduleAtFixedRate(this::cleanupExpiredItems, 1, 1, TimeUnit.SECONDS);
+        this(Item.MAX_SALE_DURATION_MILLIS);
+    }
+
+    MarketManager(long saleDurationMillis) {
+        this.saleDurationMillis = saleDurationMillis;
+        // Drop cancelled expiries at once, and pending ones on shutdown
+        scheduler.setRemoveOnCancelPolicy(true);
+        scheduler.setExecuteExistingDelayedTasksAfterShutdownPolicy(false);
     }
 
     public void initializeSellerStock(String sellerId) {
-        Map<String, Double> stock = new ConcurrentHashMap<>();
-        stock.put("flower", 5.0);
-        stock.put("sugar", 5.0);
-        stock.put("potato", 5.0);
-        stock.put("oil", 5.0);
-        sellerStocks.put(sellerId, stock);
-        logger.info("Initialized stock for seller: " + sellerId);
+        sellerStocks.put(sellerId, new SellerStock());
+        logger.log(Level.INFO, "Initialized stock for seller: {0}", sellerId);
     }
 
-    public synchronized Item startSale(String sellerId, String itemName, double quantity) {
-        Map<String, Double> stock = sellerStocks.get(sellerId);
+    public Item startSale(String sellerId, String itemName, double quantity) {
+        SellerStock stock = sellerStocks.get(sellerId);
         if (stock == null) {
             throw new IllegalStateException("Seller not found: " + sellerId);
         }
 
-        Double available = stock.get(itemName);
-        if (available == null || available < quantity) {
-            throw new IllegalStateException("Insufficient stock for " + itemName);
-        }
+        String itemId;
+        Item item;
+        synchronized (stock.lock) {
+            if (salesBySeller.containsKey(sellerId)) {
+                throw new IllegalStateException("Seller already has an active sale");
+            }
+
+            Double available = stock.quantities.get(itemName);
+            if (available == null || available < quantity) {
+                throw new IllegalStateException("Insufficient stock for " + itemName);
+            }
 
-        // Update stock
-        stock.put(itemName, available - quantity);
+            // Update stock
+            stock.quantities.put(itemName, available - quantity);
 
-        // Create new item
-        String itemId = "sale_" + sellerId + "_" + System.currentTimeMillis();
-        Item item = new Item(itemId, itemName, quantity, sellerId);
+            // Create new item
+            itemId = "sale_" + sellerId + "_" + itemSequence.incrementAndGet();
+            item = new Item(itemId, itemName, quantity, sellerId, System.currentTimeMillis() + saleDurationMillis);
+            salesBySeller.put(sellerId, itemId);
+        }
         activeItems.put(itemId, item);
+        ScheduledFuture<?> expiry;
+        try {
+            expiry = scheduler.schedule(() -> closeSale(itemId),
+                    (long) (item.getRemainingTime() * 1000), TimeUnit.MILLISECONDS);
+        } catch (RejectedExecutionException e) {
+            // Racing shutdown; undo the sale so the stock and the seller's slot come back
+            closeSale(itemId);
+            throw new IllegalStateException("Market is shutting down");
+        }
+        expiryTasks.put(itemId, expiry);
+        // Already expired or ended before the put; don't keep its dead future around
+        if (!activeItems.containsKey(itemId)) {
+            expiryTasks.remove(itemId, expiry);
+        }
 
-        logger.info(String.format("Sale started: %s, quantity: %.2f, seller: %s", 
-                    itemName, quantity, sellerId));
+        logger.log(Level.INFO, "Sale started: {0}, quantity: {1,number,0.00}, seller: {2}",
+                new Object[] {itemName, quantity, sellerId});
         return item;
     }
 
-    public synchronized boolean handleBuyRequest(String itemId, double quantity, String buyerId) {
+    public boolean handleBuyRequest(String itemId, double quantity, String buyerId) {
         Item item = activeItems.get(itemId);
         if (item == null) {
-            logger.warning("Item not found: " + itemId);
+            logger.log(Level.WARNING, "Item not found: {0}", itemId);
             return false;
         }
 
         if (item.isExpired()) {
-            logger.warning("Item expired: " + itemId);
+            logger.log(Level.WARNING, "Item expired: {0}", itemId);
             return false;
         }
 
         boolean success = item.tryPurchase(quantity);
         if (success) {
-            logger.info(String.format("Purchase successful: %.2f of %s by %s", 
-                        quantity, itemId, buyerId));
+            logger.log(Level.INFO, "Purchase successful: {0,number,0.00} of {1} by {2}",
+                    new Object[] {quantity, itemId, buyerId});
         } else {
-            logger.warning(String.format("Purchase failed: %.2f of %s by %s", 
-                        quantity, itemId, buyerId));
+            logger.log(Level.WARNING, "Purchase failed: {0,number,0.00} of {1} by {2}",
+                    new Object[] {quantity, itemId, buyerId});
         }
         return success;
     }
 
-    public synchronized void endSale(String itemId) {
+    public boolean endSale(String itemId, String sellerId) {
+        Item item = activeItems.get(itemId);
+        if (item == null || !item.getSellerId().equals(sellerId)) {
+            return false;
+        }
+        return closeSale(itemId) != null;
+    }
+
+    private Item closeSale(String itemId) {
+        ScheduledFuture<?> expiry = expiryTasks.remove(itemId);
+        if (expiry != null) {
+            expiry.cancel(false);
+        }
+        // Only one caller wins the remove, so expiry and SALE_END never both return stock
         Item item = activeItems.remove(itemId);
-        if (item != null && item.getQuantity() > 0) {
+        if (item == null) {
+            return null;
+        }
+        salesBySeller.remove(item.getSellerId(), itemId);
+
+        // Zeroing the quantity makes any purchase still in flight on this item fail
+        double unsold = item.takeRemaining();
+        if (unsold > 0) {
             // Return unsold quantity to stock
-            Map<String, Double> stock = sellerStocks.get(item.getSellerId());
+            SellerStock stock = sellerStocks.get(item.getSellerId());
             if (stock != null) {
-                stock.merge(item.getName(), item.getQuantity(), Double::sum);
+                synchronized (stock.lock) {
+                    stock.quantities.merge(item.getName(), unsold, Double::sum);
+                }
             }
         }
-        logger.info("Sale ended: " + itemId);
+        logger.log(Level.INFO, "Sale ended: {0}", itemId);
+        return item;
     }
 
     public List<Item> getActiveItems() {
+        long now = System.currentTimeMillis();
         return activeItems.values().stream()
-                .filter(item -> !item.isExpired())
+                .filter(item -> !item.isExpired(now))
                 .collect(Collectors.toList());
     }
 
-    private void cleanupExpiredItems() {
-        activeItems.values().stream()
-                .filter(Item::isExpired)
-                .map(Item::getId)
-                .forEach(this::endSale);
-    }
-
     public void shutdown() {
         scheduler.shutdown();
         try {
@@ -108,4 +163,10 @@ public class MarketManager {
             Thread.currentThread().interrupt();
         }
     }
+
+    private static final class SellerStock {
+        final Object lock = new Object();
+        // Guarded by lock
+        final Map<String, Double> quantities = new HashMap<>(DEFAULT_STOCK);
+    }
 }
\ No newline at end of file
@@ -4,16 +4,28 @@ import java.io.*;
 import java.net.*;
 import java.util.*;
 import java.util.concurrent.*;
+import java.util.concurrent.atomic.AtomicBoolean;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.concurrent.atomic.AtomicReference;
 import java.time.Instant;
 import java.util.logging.*;
 
 public class MarketServer {
     private static final Logger logger = Logger.getLogger(MarketServer.class.getName());
+    private static final long BROADCAST_INTERVAL_MS = 20;
+    // A buyer whose socket hasn't taken a frame in this long has stopped reading
+    private static final long SEND_TIMEOUT_NANOS = TimeUnit.SECONDS.toNanos(10);
     private final int port;
     private final MarketManager marketManager;
     private final ExecutorService executorService;
     private final ConcurrentHashMap<String, ClientHandler> clients;
+    // Buyer subset of clients
+    private final ConcurrentHashMap<String, ClientHandler> buyers;
+    private final ScheduledExecutorService broadcaster;
+    private final AtomicBoolean broadcastPending = new AtomicBoolean();
+    private final AtomicLong clientSequence = new AtomicLong();
     private volatile boolean running;
+    private boolean stopped;
     private ServerSocket serverSocket;
     private final int TIMEOUT_SECONDS = 60;
 
@@ -22,19 +34,17 @@ public class MarketServer {
         this.marketManager = new MarketManager();
         this.executorService = Executors.newCachedThreadPool();
         this.clients = new ConcurrentHashMap<>();
-        setupLogging();
-    }
-
-    private void setupLogging() {
-        ConsoleHandler handler = new ConsoleHandler();
-        handler.setFormatter(new SimpleFormatter());
-        logger.addHandler(handler);
-        logger.setLevel(Level.ALL);
+        this.buyers = new ConcurrentHashMap<>();
+        this.broadcaster = Executors.newSingleThreadScheduledExecutor(Threads.daemonThreadFactory("stock-broadcast"));
     }
 
     public void start() {
         try {
-            serverSocket = new ServerSocket(port);
+            serverSocket = new ServerSocket();
+            serverSocket.setReuseAddress(true);
+            // Inherited by accepted sockets; must be set before bind
+            serverSocket.setReceiveBufferSize(MessageCodec.SOCKET_BUFFER_SIZE);
+            serverSocket.bind(new InetSocketAddress(port));
             running = true;
             logger.info("Server started on port " + port);
 
@@ -42,7 +52,7 @@ public class MarketServer {
                 Socket clientSocket = serverSocket.accept();
                 ClientHandler handler = new ClientHandler(clientSocket);
                 executorService.submit(handler);
-                logger.info("New client connected: " + clientSocket.getInetAddress());
+                logger.log(Level.INFO, "New client connected: {0}", clientSocket.getInetAddress());
             }
         } catch (IOException e) {
             logger.severe("Server error: " + e.getMessage());
@@ -51,32 +61,99 @@ public class MarketServer {
         }
     }
 
-    void shutdown() {
+    synchronized void shutdown() {
+        // Called both from start()'s finally block and from the JVM shutdown hook
+        if (stopped) {
+            return;
+        }
+        stopped = true;
         running = false;
         try {
             if (serverSocket != null && !serverSocket.isClosed()) {
                 serverSocket.close();
             }
-            executorService.shutdown();
-            clients.values().forEach(ClientHandler::close);
-            logger.info("Server shutdown complete");
         } catch (IOException e) {
             logger.severe("Error during shutdown: " + e.getMessage());
         }
+
+        broadcaster.shutdownNow();
+        // Closing the sockets unblocks every handler's read so the pool can drain
+        clients.values().forEach(ClientHandler::close);
+        executorService.shutdown();
+        try {
+            if (!executorService.awaitTermination(5, TimeUnit.SECONDS)) {
+                executorService.shutdownNow();
+            }
+        } catch (InterruptedException e) {
+            executorService.shutdownNow();
+            Thread.currentThread().interrupt();
+        }
+        marketManager.shutdown();
+        logger.info("Server shutdown complete");
+    }
+
+    private void requestStockBroadcast() {
+        // Coalesce bursts of changes into one snapshot per interval
+        if (running && broadcastPending.compareAndSet(false, true)) {
+            try {
+                broadcaster.schedule(this::broadcastStockUpdate, BROADCAST_INTERVAL_MS, TimeUnit.MILLISECONDS);
+            } catch (RejectedExecutionException e) {
+                // Lost a race with shutdown
+                broadcastPending.set(false);
+            }
+        }
+    }
+
+    private void broadcastStockUpdate() {
+        // Cleared before the snapshot, so any change made after it schedules another broadcast
+        broadcastPending.set(false);
+        List<Item> items = marketManager.getActiveItems();
+        Message update = new Message(
+            MessageType.STOCK_UPDATE,
+            Map.of("items", items),
+            "server"
+        );
+
+        byte[] frame;
+        try {
+            frame = MessageCodec.encodeFrame(update);
+        } catch (IOException e) {
+            logger.warning("Failed to encode stock update: " + e.getMessage());
+            return;
+        }
+
+        // Written from the handler pool so a slow buyer can't hold up the rest
+        long now = System.nanoTime();
+        for (ClientHandler buyer : buyers.values()) {
+            if (buyer.isStalled(now)) {
+                logger.log(Level.WARNING, "Dropping buyer stalled on a send: {0}", buyer.clientId);
+                buyer.close();
+            } else {
+                buyer.queueStockUpdate(frame);
+            }
+        }
     }
 
     private class ClientHandler implements Runnable {
         private final Socket socket;
-        private final ObjectOutputStream out;
-        private final ObjectInputStream in;
+        private final DataOutputStream out;
+        private final FrameReader in;
         private String clientId;
         private ClientType clientType;
         private Instant lastHeartbeat;
+        // Latest stock update not yet written; a newer one replaces it
+        private final AtomicReference<byte[]> pendingUpdate = new AtomicReference<>();
+        private volatile boolean writing;
+        private volatile long writeStartedNanos;
 
         public ClientHandler(Socket socket) throws IOException {
             this.socket = socket;
-            this.out = new ObjectOutputStream(socket.getOutputStream());
-            this.in = new ObjectInputStream(socket.getInputStream());
+            // Clients heartbeat every 10s, so a read blocked this long means the peer is gone
+            socket.setSoTimeout(TIMEOUT_SECONDS * 1000);
+            socket.setTcpNoDelay(true);
+            socket.setSendBufferSize(MessageCodec.SOCKET_BUFFER_SIZE);
+            this.out = new DataOutputStream(new BufferedOutputStream(socket.getOutputStream()));
+            this.in = new FrameReader(new BufferedInputStream(socket.getInputStream(), MessageCodec.RECEIVE_BUFFER_SIZE));
             this.lastHeartbeat = Instant.now();
         }
 
@@ -86,19 +163,21 @@ public class MarketServer {
                 handleRegistration();
                 
                 while (running && socket.isConnected()) {
-                    Message message = (Message) in.readObject();
+                    Message message = in.read();
                     handleMessage(message);
                     lastHeartbeat = Instant.now();
                 }
-            } catch (IOException | ClassNotFoundException e) {
-                logger.warning("Client disconnected: " + clientId);
+            } catch (SocketTimeoutException e) {
+                logger.log(Level.WARNING, "Client timed out: {0}", clientId);
+            } catch (IOException e) {
+                logger.log(Level.WARNING, "Client disconnected: {0}", clientId);
             } finally {
                 close();
             }
         }
 
-        private void handleRegistration() throws IOException, ClassNotFoundException {
-            Message registration = (Message) in.readObject();
+        private void handleRegistration() throws IOException {
+            Message registration = in.read();
             if (registration.getType() != MessageType.REGISTER) {
                 throw new IllegalStateException("First message must be registration");
             }
@@ -110,6 +189,8 @@ public class MarketServer {
             // Initialize resources for seller
             if (clientType == ClientType.SELLER) {
                 marketManager.initializeSellerStock(clientId);
+            } else if (clientType == ClientType.BUYER) {
+                buyers.put(clientId, this);
             }
 
             // Send acknowledgment
@@ -119,17 +200,20 @@ public class MarketServer {
                 "server"
             ));
 
-            logger.info("Client registered: " + clientId + " as " + clientType);
+            logger.log(Level.INFO, "Client registered: {0} as {1}", new Object[] {clientId, clientType});
         }
 
         private void handleMessage(Message message) {
             try {
-                logger.info("Handling message: " + message.getType() + " from " + clientId);
+                logger.fine(() -> "Handling message: " + message.getType() + " from " + clientId);
                 
                 switch (message.getType()) {
                     case SALE_START:
                         handleSaleStart(message);
                         break;
+                    case SALE_END:
+                        handleSaleEnd(message);
+                        break;
                     case BUY_REQUEST:
                         handleBuyRequest(message);
                         break;
@@ -169,7 +253,26 @@ public class MarketServer {
             ));
 
             // Broadcast update to buyers
-            broadcastStockUpdate(item.getId());
+            requestStockBroadcast();
+        }
+
+        private void handleSaleEnd(Message message) {
+            String itemId = (String) message.getData().get("itemId");
+
+            boolean success = marketManager.endSale(itemId, clientId);
+
+            sendMessage(new Message(
+                MessageType.SALE_END,
+                Map.of(
+                    "success", success,
+                    "itemId", itemId
+                ),
+                "server"
+            ));
+
+            if (success) {
+                requestStockBroadcast();
+            }
         }
 
         private void handleBuyRequest(Message message) {
@@ -190,7 +293,7 @@ public class MarketServer {
             ));
 
             if (success) {
-                broadcastStockUpdate(itemId);
+                requestStockBroadcast();
             }
         }
 
@@ -203,26 +306,59 @@ public class MarketServer {
             ));
         }
 
-        private void broadcastStockUpdate(String itemId) {
-            List<Item> items = marketManager.getActiveItems();
-            Message update = new Message(
-                MessageType.STOCK_UPDATE,
-                Map.of("items", items),
-                "server"
-            );
-
-            clients.values().stream()
-                  .filter(client -> client.clientType == ClientType.BUYER)
-                  .forEach(client -> client.sendMessage(update));
+        private void sendMessage(Message message) {
+            byte[] frame;
+            try {
+                frame = MessageCodec.encodeFrame(message);
+            } catch (IOException e) {
+                logger.warning("Failed to encode message for " + clientId + ": " + e.getMessage());
+                return;
+            }
+            sendFrame(frame, message.getType());
         }
 
-        private synchronized void sendMessage(Message message) {
+        private void sendFrame(byte[] frame, MessageType type) {
             try {
-                out.writeObject(message);
-                out.flush();
-                logger.fine("Sent message: " + message.getType() + " to " + clientId);
+                writeFrame(frame);
+                logger.fine(() -> "Sent message: " + type + " to " + clientId);
             } catch (IOException e) {
                 logger.warning("Failed to send message to " + clientId + ": " + e.getMessage());
+                // Dead connection; drop it so broadcasts skip it
+                close();
+            }
+        }
+
+        private synchronized void writeFrame(byte[] frame) throws IOException {
+            writeStartedNanos = System.nanoTime();
+            writing = true;
+            try {
+                MessageCodec.sendFrame(out, frame);
+            } finally {
+                writing = false;
+            }
+        }
+
+        private boolean isStalled(long nowNanos) {
+            return writing && nowNanos - writeStartedNanos > SEND_TIMEOUT_NANOS;
+        }
+
+        private void queueStockUpdate(byte[] frame) {
+            // Only an update into an empty slot starts a drain
+            if (pendingUpdate.getAndSet(frame) == null) {
+                try {
+                    executorService.execute(this::drainStockUpdates);
+                } catch (RejectedExecutionException e) {
+                    pendingUpdate.set(null);
+                }
+            }
+        }
+
+        private void drainStockUpdates() {
+            byte[] frame;
+            while ((frame = pendingUpdate.get()) != null) {
+                sendFrame(frame, MessageType.STOCK_UPDATE);
+                // Fails if a newer update arrived during the write, which is then sent next
+                pendingUpdate.compareAndSet(frame, null);
             }
         }
 
@@ -236,9 +372,13 @@ public class MarketServer {
 
         private void close() {
             try {
-                clients.remove(clientId);
+                // Never registered
+                if (clientId != null) {
+                    clients.remove(clientId);
+                    buyers.remove(clientId);
+                }
                 socket.close();
-                logger.info("Client handler closed: " + clientId);
+                logger.log(Level.INFO, "Client handler closed: {0}", clientId);
             } catch (IOException e) {
                 logger.warning("Error closing client handler: " + e.getMessage());
             }
@@ -246,6 +386,6 @@ public class MarketServer {
     }
 
     private String generateClientId() {
-        return UUID.randomUUID().toString().substring(0, 8);
+        return "client_" + clientSequence.incrementAndGet();
     }
 }
\ No newline at end of file
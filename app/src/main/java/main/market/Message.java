@@ -1,19 +1,22 @@
 package main.java.main.market;
 
-import java.io.Serializable;
 import java.util.Map;
 
-public class Message implements Serializable {
+public class Message {
     private final MessageType type;
     private final Map<String, Object> data;
     private final String senderId;
     private final long timestamp;
 
     public Message(MessageType type, Map<String, Object> data, String senderId) {
+        this(type, data, senderId, System.currentTimeMillis());
+    }
+
+    Message(MessageType type, Map<String, Object> data, String senderId, long timestamp) {
         this.type = type;
         this.data = data;
         this.senderId = senderId;
-        this.timestamp = System.currentTimeMillis();
+        this.timestamp = timestamp;
     }
 
     public MessageType getType() {
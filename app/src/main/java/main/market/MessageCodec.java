@@ -0,0 +1,251 @@
+package main.java.main.market;
+
+import java.io.*;
+import java.nio.BufferUnderflowException;
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.*;
+
+public final class MessageCodec {
+    // Every frame is a 4-byte big-endian payload length followed by the payload
+    public static final int HEADER_SIZE = 4;
+    public static final int MAX_FRAME_SIZE = 16 * 1024 * 1024;
+    public static final int SOCKET_BUFFER_SIZE = 256 * 1024;
+    public static final int RECEIVE_BUFFER_SIZE = 64 * 1024;
+    private static final byte[] EMPTY_HEADER = new byte[HEADER_SIZE];
+    private static final MessageType[] MESSAGE_TYPES = MessageType.values();
+    // Larger buffers are dropped after use instead of being pinned to the thread
+    private static final int MAX_RETAINED_BUFFER = 64 * 1024;
+    private static final ThreadLocal<EncodeBuffer> ENCODE_BUFFER = ThreadLocal.withInitial(EncodeBuffer::new);
+    // One-byte tags for the value types that appear in Message data
+    private static final int TAG_NULL = 0;
+    private static final int TAG_STRING = 1;
+    private static final int TAG_DOUBLE = 2;
+    private static final int TAG_BOOLEAN = 3;
+    private static final int TAG_LONG = 4;
+    private static final int TAG_INT = 5;
+    private static final int TAG_ITEM = 6;
+    private static final int TAG_LIST = 7;
+    private static final int TAG_MAP = 8;
+    // Messages only nest map -> list -> item; anything deeper is malformed
+    private static final int MAX_NESTING = 8;
+
+    private MessageCodec() {
+    }
+
+    public static byte[] encodeFrame(Message message) throws IOException {
+        // Patch the length into a placeholder header so the frame is one array
+        EncodeBuffer buffer = ENCODE_BUFFER.get();
+        buffer.reset();
+        buffer.write(EMPTY_HEADER, 0, HEADER_SIZE);
+        writeMessage(buffer.data, message);
+        byte[] frame = buffer.release();
+        putLength(frame, frame.length - HEADER_SIZE);
+        return frame;
+    }
+
+    public static Message decode(byte[] data, int offset, int length) throws IOException {
+        ByteBuffer in = ByteBuffer.wrap(data, offset, length);
+        try {
+            int ordinal = in.get() & 0xFF;
+            if (ordinal >= MESSAGE_TYPES.length) {
+                throw new IOException("Unknown message type: " + ordinal);
+            }
+            String senderId = readString(in);
+            long timestamp = in.getLong();
+            @SuppressWarnings("unchecked")
+            Map<String, Object> fields = (Map<String, Object>) readValue(in, 0);
+            return new Message(MESSAGE_TYPES[ordinal], fields, senderId, timestamp);
+        } catch (BufferUnderflowException e) {
+            throw new EOFException("Truncated message payload");
+        }
+    }
+
+    private static void writeMessage(DataOutputStream out, Message message) throws IOException {
+        // Type, sender, timestamp, then the data map
+        out.writeByte(message.getType().ordinal());
+        writeString(out, message.getSenderId());
+        out.writeLong(message.getTimestamp());
+        writeValue(out, message.getData());
+    }
+
+    private static void writeValue(DataOutputStream out, Object value) throws IOException {
+        if (value == null) {
+            out.writeByte(TAG_NULL);
+        } else if (value instanceof String) {
+            out.writeByte(TAG_STRING);
+            writeString(out, (String) value);
+        } else if (value instanceof Double) {
+            out.writeByte(TAG_DOUBLE);
+            out.writeDouble((Double) value);
+        } else if (value instanceof Boolean) {
+            out.writeByte(TAG_BOOLEAN);
+            out.writeBoolean((Boolean) value);
+        } else if (value instanceof Long) {
+            out.writeByte(TAG_LONG);
+            out.writeLong((Long) value);
+        } else if (value instanceof Integer) {
+            out.writeByte(TAG_INT);
+            out.writeInt((Integer) value);
+        } else if (value instanceof Item) {
+            out.writeByte(TAG_ITEM);
+            writeItem(out, (Item) value);
+        } else if (value instanceof List) {
+            List<?> list = (List<?>) value;
+            out.writeByte(TAG_LIST);
+            out.writeInt(list.size());
+            for (Object element : list) {
+                writeValue(out, element);
+            }
+        } else if (value instanceof Map) {
+            Map<?, ?> map = (Map<?, ?>) value;
+            out.writeByte(TAG_MAP);
+            out.writeInt(map.size());
+            for (Map.Entry<?, ?> entry : map.entrySet()) {
+                writeString(out, (String) entry.getKey());
+                writeValue(out, entry.getValue());
+            }
+        } else {
+            throw new IOException("Unsupported value type: " + value.getClass().getName());
+        }
+    }
+
+    private static Object readValue(ByteBuffer in, int depth) throws IOException {
+        if (depth > MAX_NESTING) {
+            throw new IOException("Nesting too deep");
+        }
+        int tag = in.get() & 0xFF;
+        switch (tag) {
+            case TAG_NULL:
+                return null;
+            case TAG_STRING:
+                return readString(in);
+            case TAG_DOUBLE:
+                return in.getDouble();
+            case TAG_BOOLEAN:
+                return in.get() != 0;
+            case TAG_LONG:
+                return in.getLong();
+            case TAG_INT:
+                return in.getInt();
+            case TAG_ITEM:
+                return readItem(in);
+            case TAG_LIST: {
+                int size = readCount(in);
+                List<Object> list = new ArrayList<>(size);
+                for (int i = 0; i < size; i++) {
+                    list.add(readValue(in, depth + 1));
+                }
+                return list;
+            }
+            case TAG_MAP: {
+                int size = readCount(in);
+                Map<String, Object> map = new HashMap<>(size * 2);
+                for (int i = 0; i < size; i++) {
+                    map.put(readString(in), readValue(in, depth + 1));
+                }
+                return map;
+            }
+            default:
+                throw new IOException("Unknown value tag: " + tag);
+        }
+    }
+
+    private static void writeItem(DataOutputStream out, Item item) throws IOException {
+        // Immutable fields are encoded once per item; only the quantity is rewritten
+        byte[] fields = item.getEncodedFields();
+        if (fields == null) {
+            ByteArrayOutputStream buffer = new ByteArrayOutputStream(64);
+            DataOutputStream fieldsOut = new DataOutputStream(buffer);
+            writeString(fieldsOut, item.getId());
+            writeString(fieldsOut, item.getName());
+            writeString(fieldsOut, item.getSellerId());
+            fieldsOut.writeLong(item.getSaleEndMillis());
+            fields = buffer.toByteArray();
+            item.setEncodedFields(fields);
+        }
+        out.write(fields);
+        out.writeDouble(item.getQuantity());
+    }
+
+    private static Item readItem(ByteBuffer in) throws IOException {
+        String id = readString(in);
+        String name = readString(in);
+        String sellerId = readString(in);
+        long saleEndMillis = in.getLong();
+        return new Item(id, name, in.getDouble(), sellerId, saleEndMillis);
+    }
+
+    private static void writeString(DataOutputStream out, String value) throws IOException {
+        if (value == null) {
+            out.writeInt(-1);
+            return;
+        }
+        byte[] bytes = value.getBytes(StandardCharsets.UTF_8);
+        out.writeInt(bytes.length);
+        out.write(bytes);
+    }
+
+    private static String readString(ByteBuffer in) throws IOException {
+        int length = in.getInt();
+        if (length == -1) {
+            return null;
+        }
+        if (length < 0 || length > in.remaining()) {
+            throw new IOException("Invalid string length: " + length);
+        }
+        String value = new String(in.array(), in.arrayOffset() + in.position(), length, StandardCharsets.UTF_8);
+        in.position(in.position() + length);
+        return value;
+    }
+
+    private static int readCount(ByteBuffer in) throws IOException {
+        // Every element takes at least one byte, so a count can never exceed what is left
+        int count = in.getInt();
+        if (count < 0 || count > in.remaining()) {
+            throw new IOException("Invalid element count: " + count);
+        }
+        return count;
+    }
+
+    public static void sendFrame(OutputStream out, byte[] frame) throws IOException {
+        out.write(frame);
+        out.flush();
+    }
+
+    public static int getLength(byte[] header) throws IOException {
+        return checkLength((header[0] & 0xFF) << 24 | (header[1] & 0xFF) << 16
+                | (header[2] & 0xFF) << 8 | (header[3] & 0xFF));
+    }
+
+    private static void putLength(byte[] header, int length) {
+        header[0] = (byte) (length >>> 24);
+        header[1] = (byte) (length >>> 16);
+        header[2] = (byte) (length >>> 8);
+        header[3] = (byte) length;
+    }
+
+    private static int checkLength(int length) throws IOException {
+        if (length < 0 || length > MAX_FRAME_SIZE) {
+            throw new IOException("Invalid frame length: " + length);
+        }
+        return length;
+    }
+
+    // Per-thread scratch buffer for encoding
+    private static final class EncodeBuffer extends ByteArrayOutputStream {
+        final DataOutputStream data = new DataOutputStream(this);
+
+        EncodeBuffer() {
+            super(256);
+        }
+
+        byte[] release() {
+            byte[] bytes = toByteArray();
+            if (buf.length > MAX_RETAINED_BUFFER) {
+                ENCODE_BUFFER.remove();
+            }
+            return bytes;
+        }
+    }
+}
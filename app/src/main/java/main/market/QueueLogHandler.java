@@ -0,0 +1,85 @@
+package main.java.main.market;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.concurrent.BlockingQueue;
+import java.util.concurrent.LinkedBlockingQueue;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicLong;
+import java.util.logging.*;
+
+public class QueueLogHandler extends Handler {
+    private static final int BATCH_SIZE = 512;
+    private static final int CAPACITY = 8192;
+    private final Handler target;
+    // Bounded so a stalled target drops records instead of growing the heap
+    private final BlockingQueue<LogRecord> queue = new LinkedBlockingQueue<>(CAPACITY);
+    private final AtomicLong dropped = new AtomicLong();
+    private final Thread writer;
+    private volatile boolean closed;
+
+    public QueueLogHandler(Handler target) {
+        this.target = target;
+        this.writer = new Thread(this::drainQueue, "log-writer");
+        this.writer.setDaemon(true);
+        this.writer.start();
+    }
+
+    @Override
+    public void publish(LogRecord record) {
+        // Callers only enqueue; formatting and I/O happen on the writer thread
+        if (!closed && isLoggable(record) && !queue.offer(record)) {
+            dropped.incrementAndGet();
+        }
+    }
+
+    private void drainQueue() {
+        List<LogRecord> batch = new ArrayList<>(BATCH_SIZE);
+        try {
+            while (!closed) {
+                batch.add(queue.take());
+                queue.drainTo(batch, BATCH_SIZE - 1);
+                writeBatch(batch);
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        }
+    }
+
+    private void writeBatch(List<LogRecord> batch) {
+        long lost = dropped.getAndSet(0);
+        if (lost > 0) {
+            target.publish(new LogRecord(Level.WARNING, "Log queue full; dropped " + lost + " records"));
+        }
+        for (LogRecord record : batch) {
+            target.publish(record);
+        }
+        target.flush();
+        batch.clear();
+    }
+
+    @Override
+    public void flush() {
+        target.flush();
+    }
+
+    @Override
+    public void close() {
+        closed = true;
+        writer.interrupt();
+        try {
+            writer.join(TimeUnit.SECONDS.toMillis(1));
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        }
+        // Still mid-batch; writing here too would interleave with it on the target
+        if (writer.isAlive()) {
+            return;
+        }
+
+        List<LogRecord> remaining = new ArrayList<>(queue.size());
+        queue.drainTo(remaining);
+        writeBatch(remaining);
+        target.close();
+    }
+}
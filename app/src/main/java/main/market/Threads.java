@@ -0,0 +1,21 @@
+package main.java.main.market;
+
+import java.util.concurrent.ThreadFactory;
+
+public final class Threads {
+    private Threads() {
+    }
+
+    public static ThreadFactory daemonThreadFactory(String name) {
+        // A stack size of 0 leaves the JVM default in place
+        return daemonThreadFactory(name, 0);
+    }
+
+    public static ThreadFactory daemonThreadFactory(String name, long stackSize) {
+        return runnable -> {
+            Thread thread = new Thread(null, runnable, name, stackSize);
+            thread.setDaemon(true);
+            return thread;
+        };
+    }
+}
@@ -0,0 +1,53 @@
+package main.java.main.market;
+
+import java.util.*;
+import java.util.concurrent.*;
+import java.util.concurrent.atomic.AtomicInteger;
+
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.*;
+
+class ItemTest {
+    @Test void concurrentPurchasesNeverOversell() throws Exception {
+        Item item = new Item("sale_1", "sugar", 100.0, "seller");
+        ExecutorService pool = Executors.newFixedThreadPool(8);
+        AtomicInteger sold = new AtomicInteger();
+        List<Callable<Void>> buyers = new ArrayList<>();
+        for (int i = 0; i < 8; i++) {
+            buyers.add(() -> {
+                for (int j = 0; j < 50; j++) {
+                    if (item.tryPurchase(1.0)) {
+                        sold.incrementAndGet();
+                    }
+                }
+                return null;
+            });
+        }
+        try {
+            for (Future<Void> result : pool.invokeAll(buyers)) {
+                result.get();
+            }
+        } finally {
+            pool.shutdown();
+        }
+
+        assertEquals(100, sold.get());
+        assertEquals(0.0, item.getQuantity());
+    }
+
+    @Test void rejectsPurchaseLargerThanRemaining() {
+        Item item = new Item("sale_1", "sugar", 2.0, "seller");
+
+        assertFalse(item.tryPurchase(2.5));
+        assertEquals(2.0, item.getQuantity());
+        assertTrue(item.tryPurchase(2.0));
+        assertFalse(item.tryPurchase(0.1));
+    }
+
+    @Test void rejectsNaNPurchase() {
+        Item item = new Item("sale_1", "sugar", 2.0, "seller");
+
+        assertFalse(item.tryPurchase(Double.NaN));
+        assertEquals(2.0, item.getQuantity());
+    }
+}
@@ -0,0 +1,65 @@
+package main.java.main.market;
+
+import org.junit.jupiter.api.AfterEach;
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.*;
+
+class MarketManagerTest {
+    private MarketManager manager;
+
+    @AfterEach void shutdown() {
+        manager.shutdown();
+    }
+
+    @Test void rejectsSecondSaleFromSameSeller() {
+        manager = new MarketManager();
+        manager.initializeSellerStock("seller");
+        manager.startSale("seller", "sugar", 1.0);
+
+        assertThrows(IllegalStateException.class, () -> manager.startSale("seller", "oil", 1.0));
+    }
+
+    @Test void onlyOwnerCanEndSale() {
+        manager = new MarketManager();
+        manager.initializeSellerStock("seller");
+        manager.initializeSellerStock("other");
+        Item item = manager.startSale("seller", "sugar", 1.0);
+
+        assertFalse(manager.endSale(item.getId(), "other"));
+        assertEquals(1, manager.getActiveItems().size());
+        assertTrue(manager.endSale(item.getId(), "seller"));
+        assertTrue(manager.getActiveItems().isEmpty());
+    }
+
+    @Test void endedSaleReturnsUnsoldStock() {
+        manager = new MarketManager();
+        manager.initializeSellerStock("seller");
+        Item item = manager.startSale("seller", "sugar", 5.0);
+        assertTrue(manager.handleBuyRequest(item.getId(), 2.0, "buyer"));
+
+        assertTrue(manager.endSale(item.getId(), "seller"));
+
+        // 5 in stock, 2 sold: exactly 3 came back
+        assertThrows(IllegalStateException.class, () -> manager.startSale("seller", "sugar", 3.5));
+        assertNotNull(manager.startSale("seller", "sugar", 3.0));
+    }
+
+    @Test void expiredSaleReturnsUnsoldStock() throws InterruptedException {
+        manager = new MarketManager(50);
+        manager.initializeSellerStock("seller");
+        manager.startSale("seller", "sugar", 5.0);
+
+        long deadline = System.currentTimeMillis() + 5_000;
+        while (true) {
+            try {
+                assertNotNull(manager.startSale("seller", "sugar", 5.0));
+                return;
+            } catch (IllegalStateException e) {
+                if (System.currentTimeMillis() > deadline) {
+                    fail("Expired sale did not return its stock");
+                }
+                Thread.sleep(10);
+            }
+        }
+    }
+}
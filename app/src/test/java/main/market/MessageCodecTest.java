@@ -0,0 +1,84 @@
+package main.java.main.market;
+
+import java.io.*;
+import java.util.List;
+import java.util.Map;
+
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.*;
+
+class MessageCodecTest {
+    @Test void frameRoundTripsMessage() throws IOException {
+        Item item = new Item("sale_1", "sugar", 2.5, "seller");
+        Message original = new Message(MessageType.STOCK_UPDATE, Map.of("items", List.of(item)), "server");
+
+        byte[] frame = MessageCodec.encodeFrame(original);
+        Message decoded = new FrameReader(new ByteArrayInputStream(frame)).read();
+
+        assertEquals(MessageType.STOCK_UPDATE, decoded.getType());
+        assertEquals("server", decoded.getSenderId());
+        assertEquals(original.getTimestamp(), decoded.getTimestamp());
+        @SuppressWarnings("unchecked")
+        List<Item> items = (List<Item>) decoded.getData().get("items");
+        assertEquals("sale_1", items.get(0).getId());
+        assertEquals(2.5, items.get(0).getQuantity());
+        assertEquals(item.getSaleEndMillis(), items.get(0).getSaleEndMillis());
+    }
+
+    @Test void cachedItemEncodingPicksUpNewQuantity() throws IOException {
+        Item item = new Item("sale_1", "sugar", 5.0, "seller");
+        MessageCodec.encodeFrame(new Message(MessageType.STOCK_UPDATE, Map.of("items", List.of(item)), "server"));
+        assertTrue(item.tryPurchase(2.0));
+
+        byte[] frame = MessageCodec.encodeFrame(new Message(MessageType.STOCK_UPDATE, Map.of("items", List.of(item)), "server"));
+        @SuppressWarnings("unchecked")
+        List<Item> items = (List<Item>) new FrameReader(new ByteArrayInputStream(frame)).read().getData().get("items");
+        assertEquals(3.0, items.get(0).getQuantity());
+        assertEquals("sale_1", items.get(0).getId());
+    }
+
+    @Test void encodedFrameCarriesItsOwnHeader() throws IOException {
+        byte[] frame = MessageCodec.encodeFrame(new Message(MessageType.ACK, Map.of("clientId", "abc"), "server"));
+
+        assertEquals(frame.length - MessageCodec.HEADER_SIZE, MessageCodec.getLength(frame));
+        FrameReader reader = new FrameReader(new ByteArrayInputStream(frame));
+        assertEquals("abc", reader.read().getData().get("clientId"));
+    }
+
+    @Test void rejectsNegativeFrameLength() {
+        FrameReader reader = new FrameReader(new ByteArrayInputStream(new byte[] {(byte) 0xFF, 0, 0, 0}));
+        assertThrows(IOException.class, reader::read);
+    }
+
+    @Test void rejectsDeeplyNestedPayload() throws IOException {
+        ByteArrayOutputStream payload = new ByteArrayOutputStream();
+        DataOutputStream out = new DataOutputStream(payload);
+        out.writeByte(MessageType.STOCK_UPDATE.ordinal());
+        out.writeInt(-1);
+        out.writeLong(0);
+        for (int i = 0; i < 100_000; i++) {
+            out.writeByte(7);
+            out.writeInt(1);
+        }
+        out.writeByte(0);
+
+        ByteArrayOutputStream wire = new ByteArrayOutputStream();
+        new DataOutputStream(wire).writeInt(payload.size());
+        payload.writeTo(wire);
+        FrameReader reader = new FrameReader(new ByteArrayInputStream(wire.toByteArray()));
+        IOException e = assertThrows(IOException.class, reader::read);
+        assertEquals("Nesting too deep", e.getMessage());
+    }
+
+    @Test void frameReaderReusesBufferAcrossFrames() throws IOException {
+        String large = "x".repeat(20_000);
+        ByteArrayOutputStream wire = new ByteArrayOutputStream();
+        wire.write(MessageCodec.encodeFrame(new Message(MessageType.ERROR, Map.of("error", large), "server")));
+        wire.write(MessageCodec.encodeFrame(new Message(MessageType.ACK, Map.of("clientId", "abc"), "server")));
+
+        FrameReader reader = new FrameReader(new ByteArrayInputStream(wire.toByteArray()));
+        assertEquals(large, reader.read().getData().get("error"));
+        assertEquals("abc", reader.read().getData().get("clientId"));
+        assertThrows(EOFException.class, reader::read);
+    }
+}
@@ -0,0 +1,30 @@
+package main.java.main.market;
+
+import java.util.*;
+import java.util.logging.*;
+
+import org.junit.jupiter.api.Test;
+import static org.junit.jupiter.api.Assertions.*;
+
+class QueueLogHandlerTest {
+    @Test void recordsQueuedBeforeCloseReachTarget() {
+        List<String> published = Collections.synchronizedList(new ArrayList<>());
+        boolean[] targetClosed = new boolean[1];
+        Handler target = new Handler() {
+            @Override public void publish(LogRecord record) { published.add(record.getMessage()); }
+            @Override public void flush() { }
+            @Override public void close() { targetClosed[0] = true; }
+        };
+
+        QueueLogHandler handler = new QueueLogHandler(target);
+        for (int i = 0; i < 100; i++) {
+            handler.publish(new LogRecord(Level.INFO, "record " + i));
+        }
+        handler.close();
+
+        assertEquals(100, published.size());
+        assertEquals("record 0", published.get(0));
+        assertEquals("record 99", published.get(99));
+        assertTrue(targetClosed[0]);
+    }
+}